@@ -1,4 +1,7 @@
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
 import datetime
 import base64
@@ -16,11 +19,31 @@ MODELS = {
     "Issuer": Issuer,
 }
 
+# Fields of an entity that hold the entityId of a related entity
+RELATED_MODELS = {
+    "badgeclass": BadgeClass,
+    "issuer": Issuer,
+}
+
+# Most prefetched entities kept by a client, the oldest are dropped first
+MAX_PREFETCHED = 500
+
 IMAGE_MIME_TYPES = {
     "svg": "image/svg+xml",
     "png": "image/png",
 }
 
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 20
+# raise_on_status=False hands the last response to _get_json once retries
+# run out so the server's error is raised as an APIError
+MAX_RETRIES = Retry(
+    total=3,
+    backoff_factor=0.3,
+    status_forcelist=[502, 503, 504],
+    raise_on_status=False,
+)
+
 Logger = logging.getLogger("badgrclient")
 
 
@@ -63,7 +86,14 @@ class BadgrClient:
             registered in the client's badge name index
 
         """
-        self.session = requests.session()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=POOL_CONNECTIONS,
+            pool_maxsize=POOL_MAXSIZE,
+            max_retries=MAX_RETRIES,
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
         self.header = {}
         self.refresh_token = refresh_token
         self.token_expires_at = None
@@ -71,6 +101,8 @@ class BadgrClient:
         self.client_id = client_id
         self.base_url = base_url
         self.unique_badge_names = unique_badge_names
+        # Data of prefetched related entities keyed by (model, entityId)
+        self._prefetched = {}
 
         if self.unique_badge_names:
             # Make a dictonary to keep track of badgenames and entity IDs
@@ -84,7 +116,7 @@ class BadgrClient:
                     "For authentication with token, also provide a \
                     refresh token"
                 )
-            self.header = {"Authorization": "Bearer {}".format(token)}
+            self._set_auth_header(token)
         else:
             self._get_auth_token(username, password)
 
@@ -109,17 +141,21 @@ class BadgrClient:
                 self._get_auth_token()
 
         url = self.base_url + endpoint
-        header = self.header
 
-        if not auth and "Authorization" in header:
-            header.pop("Authorization")
+        # The auth header lives on the session, a None value drops it
+        # for this request only
+        headers = {} if auth else {"Authorization": None}
+
+        if data is not None:
+            data = orjson.dumps(data)
+            headers["Content-Type"] = "application/json"
 
         req = self.session.request(
             method=method,
             url=url,
             params=params,
-            headers=self.header,
-            json=data,
+            headers=headers,
+            data=data,
             verify=True,
         )
 
@@ -134,7 +170,7 @@ class BadgrClient:
         """
         response = None
         try:
-            response = req.json()
+            response = orjson.loads(req.content)
         except Exception as err:
             Logger.debug(req.text)
             raise APIError("Error while decoding JSON: {0}".format(err))
@@ -178,7 +214,11 @@ class BadgrClient:
             payload["grant_type"] = "refresh_token"
             self.refresh_token = None
 
-        req = requests.post(self.base_url + "/o/token", data=payload)
+        req = self.session.post(
+            self.base_url + "/o/token",
+            data=payload,
+            headers={"Authorization": None},
+        )
 
         response = self._get_json(req)
 
@@ -186,17 +226,35 @@ class BadgrClient:
             seconds=response["expires_in"]
         )
         self.refresh_token = response["refresh_token"]
-        self.header = {"Authorization": "Bearer " + response["access_token"]}
+        self._set_auth_header(response["access_token"])
+
+    def _set_auth_header(self, token):
+        """Set the bearer token used for authenticated calls. The session
+        header is updated in place so pooled connections keep being reused
+
+        Args:
+            token (string): Access token
+        """
+        self.header = {"Authorization": "Bearer " + token}
+        self.session.headers.update(self.header)
 
     def _deserialize(
-        self, result: list
+        self, result: list, prefetch=()
     ) -> List[Union[BadgeClass, Assertion, Issuer]]:
         """
             Get the appropriate model instances list from result list
 
         Args:
             result: The result in the payload
+            prefetch (tuple, optional): Related entities to load along with the
+                result, any of 'badgeclass' and 'issuer'. Each related type is
+                fetched in a single request and models created afterwards with
+                one of their entityIds are populated without another request
+
+        Raises:
+            BadgrClientError: Unknown prefetch name
         """
+        self._check_prefetch(prefetch)
         return_value = []
 
         for i in result:
@@ -206,8 +264,67 @@ class BadgrClient:
             else:
                 return_value.append(i)
 
+        for field in prefetch:
+            self._prefetch(RELATED_MODELS[field], field, result)
+
         return return_value
 
+    @staticmethod
+    def _check_prefetch(prefetch):
+        """Check that prefetch only names known related entities
+
+        Args:
+            prefetch (tuple): Related entities to load
+
+        Raises:
+            BadgrClientError: Unknown prefetch name
+        """
+        for field in prefetch:
+            if field not in RELATED_MODELS:
+                raise BadgrClientError(
+                    "prefetch must be any of {}, got '{}'".format(
+                        ", ".join(RELATED_MODELS), field
+                    )
+                )
+
+    def _prefetch(self, model, field: str, result: list):
+        """Fetch the entities referenced by field in result, replacing any
+        earlier prefetched data of them
+
+        Args:
+            model: Model of the related entities
+            field (str): Field holding the related entityId
+            result (list): The result in the payload
+        """
+        # dict keeps the first-seen order while deduplicating
+        eids = dict.fromkeys(
+            eid for eid in (i.get(field) for i in result) if eid
+        )
+
+        for entity in model.fetch_many(self, list(eids)):
+            self._store_prefetched(model, entity.data)
+
+    def _store_prefetched(self, model, data: dict):
+        """Keep a copy of an entity's data, dropping the oldest entries once
+        MAX_PREFETCHED is reached
+
+        Args:
+            model: Model of the entity
+            data (dict): The entity's data
+        """
+        key = (model, data["entityId"])
+        # Re-insert so a refreshed entry counts as the newest
+        self._prefetched.pop(key, None)
+        self._prefetched[key] = dict(data)
+
+        while len(self._prefetched) > MAX_PREFETCHED:
+            del self._prefetched[next(iter(self._prefetched))]
+
+    def clear_prefetched(self):
+        """Drop the data of all prefetched entities so models are
+        fetched from the server again"""
+        self._prefetched.clear()
+
     def _fetch_id_or_self(self, endpoint, eid):
         """Appends entityId to endpoint if provided and calls it
 
@@ -216,7 +333,7 @@ class BadgrClient:
             eid ([type]): entityId
         """
         if eid:
-            ep = endpoint + "/{}".format(eid)
+            ep = f"{endpoint}/{eid}"
             response = self._call_api(ep)
         else:
             response = self._call_api(endpoint)
@@ -334,7 +451,7 @@ class BadgrClient:
         """
 
         if eid:
-            ep = Assertion.ENDPOINT + "/{}".format(eid)
+            ep = f"{Assertion.ENDPOINT}/{eid}"
         else:
             ep = "/v2/backpack/assertions"
 
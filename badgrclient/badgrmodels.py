@@ -1,24 +1,75 @@
 from abc import ABC
+from copy import deepcopy
 from datetime import datetime
-from .exceptions import BadgrClientError
+from .exceptions import APIError, BadgrClientError, BatchIssueError
 import logging
 from typing import List, cast
 from .util import eid_required
 
 Logger = logging.getLogger("badgrclient")
 
+# Shared default for empty list fields in request payloads
+_EMPTY = ()
+
+
+def _with_fields(query: dict, fields: List[str]) -> dict:
+    """Add a fields param to the query to ask for a partial response
+
+    Args:
+        query (dict): Query params
+        fields (list[str]): Fields to ask for
+    """
+    if not fields:
+        return query
+
+    query = dict(query or {})
+    query["fields"] = ",".join(fields)
+
+    return query
+
+
+def _mark_partial(entities: list, fields: List[str]):
+    """Mark entities loaded from a list fetched with a fields filter
+
+    Args:
+        entities (list): The fetched entities
+        fields (list[str]): Fields that were asked for
+    """
+    if not fields:
+        return
+
+    for entity in entities:
+        entity._partial = True
+
 
 class Base(ABC):
+
+    __slots__ = ("client", "entityId", "data", "_entity_ep", "_partial")
+
     def __init__(self, client, eid: str = None):
         """Base model class
 
         Args:
             client (BadgrClient): The BadgerClient instance to use for sending requests
             eid (str, optional): the entityId of the entity
+
+        Note:
+            If the entity was prefetched along with a list its data is
+            populated from the client's prefetched entities
         """
         self.client = client
         self.entityId = eid
         self.data = None
+        self._entity_ep = None
+        # Set when data came from a list fetched with a fields filter
+        self._partial = False
+
+        if eid:
+            prefetched = client._prefetched.get((type(self), eid))
+            if prefetched is not None:
+                # Copy so edits that are never saved don't leak into
+                # the prefetched data
+                self.set_data(deepcopy(prefetched))
 
     def set_data(self, data):
         """Populate the data
@@ -27,13 +78,55 @@ class Base(ABC):
             data (dict): The data to populate
         """
         self.data = data
+        self._partial = False
         if "entityId" in data:
             self.entityId = data["entityId"]
 
         return self
 
+    @classmethod
+    def fetch_many(cls, client, eids: List[str]) -> list:
+        """Fetch several entities of this type in a single request
+
+        Args:
+            client (BadgrClient): The BadgerClient instance to use for sending requests
+            eids (list[str]): entityIds of the entities to fetch
+
+        Returns:
+            list: Hydrated instances in the order of eids, entities missing
+                from the response are left out
+        """
+        if not eids:
+            return []
+
+        eids = list(dict.fromkeys(eids))
+        response = client._call_api(
+            cls.ENDPOINT, params={"entityId__in": ",".join(eids)}
+        )
+        returned = {data.get("entityId"): data for data in response["result"]}
+
+        instances = []
+
+        for eid in eids:
+            data = returned.get(eid)
+            if data is None:
+                continue
+
+            if (cls, eid) in client._prefetched:
+                client._store_prefetched(cls, data)
+
+            instances.append(cls(client).set_data(data))
+
+        return instances
+
     def get_entity_ep(self) -> str:
-        return self.ENDPOINT + "/{}".format(self.entityId)
+        # Cached as (entityId, endpoint) so reassigning entityId is picked up
+        cached = self._entity_ep
+        if cached is None or cached[0] != self.entityId:
+            cached = (self.entityId, f"{self.ENDPOINT}/{self.entityId}")
+            self._entity_ep = cached
+
+        return cached[1]
 
     @eid_required
     def delete(self) -> dict:
@@ -44,6 +137,7 @@ class Base(ABC):
         """
         ep = self.get_entity_ep()
         response = self.client._call_api(ep, "DELETE")
+        self._forget_prefetched()
 
         return response
 
@@ -51,24 +145,68 @@ class Base(ABC):
     def update(self) -> dict:
         """Update entity
 
+        Raises:
+            BadgrClientError: The entity was loaded with a fields filter, call
+                fetch() first so the whole entity is sent
+
         Returns:
             dict: Response dict
         """
+        if self._partial:
+            raise BadgrClientError(
+                "Can't update {} loaded with a fields filter, \
+                fetch it first".format(
+                    self
+                )
+            )
+
         ep = self.get_entity_ep()
         response = self.client._call_api(ep, "PUT", data=self.data)
-        # Fetch again to update self
-        self.fetch(self.get_entity_ep())
+        self._set_data_or_fetch(response)
+
         return response
 
     @eid_required
-    def fetch(self):
-        """Fetch entity from entityId"""
-        ep = self.get_entity_ep()
-        response = self.client._call_api(ep)
+    def fetch(self, ep: str = None) -> "Base":
+        """Fetch entity from entityId
+
+        Args:
+            ep (str, optional): Endpoint to fetch from. Defaults to the entity endpoint
+        """
+        response = self.client._call_api(ep or self.get_entity_ep())
+        self._forget_prefetched()
 
         result = response["result"][0]
 
-        self.set_data(result)
+        return self.set_data(result)
+
+    def _set_data_or_fetch(self, response):
+        """Update self from the entity returned by a write, fetch it again
+        if the response doesn't contain it
+
+        Args:
+            response (dict): Response of the write
+        """
+        self._forget_prefetched()
+
+        if isinstance(response, dict) and response.get("result"):
+            self.set_data(response["result"][0])
+        else:
+            self.fetch()
+
+    def _forget_prefetched(self):
+        """Drop this entity's prefetched data, it's out of date once the
+        entity is written or fetched again"""
+        self.client._prefetched.pop((type(self), self.entityId), None)
+
+    @property
+    def image(self):
+        """The entity's image. Entities loaded from a list fetched with
+        a fields filter are fetched again on first access"""
+        if self.data is None or (self._partial and "image" not in self.data):
+            self.fetch()
+
+        return self.data.get("image")
 
     def __repr__(self):
         return "{}({})".format(self.__class__.__name__, self.entityId)
@@ -76,7 +214,10 @@ class Base(ABC):
 
 class Assertion(Base):
 
+    __slots__ = ()
+
     ENDPOINT = "/v2/assertions"
+    ISSUE_BATCH_SIZE = 50
 
     def create(
         self,
@@ -114,33 +255,15 @@ class Assertion(Base):
             You can indentify the badge either by providing eid or if unique_badge_names
             is enabled in your client then by providing issuer_eid and badge_name
         """
-        # TODO: add other types of recipient identifiers
-        payload = {
-            "recipient": {
-                "type": "email",
-                "identity": recipient_email,
-            },
-            "narrative": narrative,
-            "evidence": evidence or [],
-            "notify": notify,
-            "expires": expires,
-            "issuedOn": issued_on
-            or datetime.utcnow().strftime("%Y-%m-%d %H:%M:%SZ"),
-        }
-
-        if not badge_eid and self.client.unique_badge_names:
-            badge_eid = self.client.get_eid_from_badge_name(
-                badge_name, issuer_eid
-            )
-
-        if not badge_eid:
-            error_msg = "Couldn't get badge_eid. If unique_badge_names is enabled \
-                you might need to call BadgrClient.load_badge_names(issuer)"
-            Logger.error(error_msg)
-            raise BadgrClientError(error_msg)
+        payload = Assertion._build_payload(
+            recipient_email, narrative, evidence, expires, issued_on, notify
+        )
+        badge_eid = Assertion._get_badge_eid(
+            self.client, badge_eid, badge_name, issuer_eid
+        )
 
         response = self.client._call_api(
-            BadgeClass.ENDPOINT + "/{}/assertions".format(badge_eid),
+            f"{BadgeClass.ENDPOINT}/{badge_eid}/assertions",
             "POST",
             data=payload,
         )
@@ -149,6 +272,120 @@ class Assertion(Base):
 
         return self
 
+    @classmethod
+    def create_many(cls, client, specs: List[dict]) -> List["Assertion"]:
+        """Issue Assertions to several recipients. Assertions of the same
+        badgeclass are issued together, ISSUE_BATCH_SIZE per request
+
+        Args:
+            client (BadgrClient): The BadgerClient instance to use for sending requests
+            specs (list[dict]): Keyword arguments of
+                :func:`~badgrclient.badgrmodels.Assertion.create` for each assertion
+
+        Raises:
+            BadgrClientError: Couldn't get eid/ Eid not provided
+            BatchIssueError: A batch failed or returned a different number of
+                assertions than it was sent. Batches are not atomic, the
+                assertions issued by earlier batches are on the error
+
+        Returns:
+            List[Assertion]: The issued assertions in the order of specs
+        """
+        # Group by badgeclass and notify since the batch endpoint takes
+        # a single notification flag for all of its assertions
+        batches = {}
+
+        for index, spec in enumerate(specs):
+            spec = dict(spec)
+            badge_eid = cls._get_badge_eid(
+                client,
+                spec.pop("badge_eid", None),
+                spec.pop("badge_name", None),
+                spec.pop("issuer_eid", None),
+            )
+            notify = spec.get("notify", True)
+            batch = batches.setdefault((badge_eid, notify), ([], []))
+            batch[0].append(index)
+            batch[1].append(cls._build_payload(**spec))
+
+        assertions = [None] * len(specs)
+
+        for (badge_eid, notify), (indexes, payloads) in batches.items():
+            ep = f"{BadgeClass.ENDPOINT}/{badge_eid}/issue"
+
+            for start in range(0, len(payloads), cls.ISSUE_BATCH_SIZE):
+                end = start + cls.ISSUE_BATCH_SIZE
+                batch = payloads[start:end]
+                try:
+                    response = client._call_api(
+                        ep,
+                        "POST",
+                        data={
+                            "assertions": batch,
+                            "create_notification": notify,
+                        },
+                    )
+                except APIError as err:
+                    raise BatchIssueError(str(err), assertions) from err
+
+                result = response["result"]
+                if len(result) != len(batch):
+                    error_msg = "Issued {} of {} assertions of badgeclass \
+                        {}".format(
+                        len(result), len(batch), badge_eid
+                    )
+                    Logger.error(error_msg)
+                    raise BatchIssueError(error_msg, assertions)
+
+                for index, data in zip(indexes[start:end], result):
+                    assertions[index] = cls(client).set_data(data)
+
+        return assertions
+
+    @staticmethod
+    def _build_payload(
+        recipient_email,
+        narrative=None,
+        evidence=None,
+        expires=None,
+        issued_on=None,
+        notify=True,
+    ) -> dict:
+        """Build the request payload of a single assertion"""
+        # TODO: add other types of recipient identifiers
+        fields = (
+            ("recipient", {"type": "email", "identity": recipient_email}),
+            ("narrative", narrative),
+            ("evidence", evidence or _EMPTY),
+            ("notify", notify),
+            ("expires", expires),
+            (
+                "issuedOn",
+                issued_on
+                or datetime.utcnow().strftime("%Y-%m-%d %H:%M:%SZ"),
+            ),
+        )
+
+        return {k: v for k, v in fields if v is not None}
+
+    @staticmethod
+    def _get_badge_eid(client, badge_eid, badge_name, issuer_eid) -> str:
+        """Get the badgeclass entityId, looking it up by badge name if needed
+
+        Raises:
+            BadgrClientError: Couldn't get eid/ Eid not provided
+        """
+        if not badge_eid and client.unique_badge_names:
+            badge_eid = client.get_eid_from_badge_name(badge_name, issuer_eid)
+
+        if not badge_eid:
+            error_msg = "Couldn't get badge_eid. If unique_badge_names is enabled \
+                you might need to call BadgrClient.load_badge_names(issuer)"
+            Logger.error(error_msg)
+            raise BadgrClientError(error_msg)
+
+        return badge_eid
+
     @eid_required
     def revoke(self, reason) -> dict:
         """Revoke this assertion
@@ -159,7 +396,7 @@ class Assertion(Base):
         Returns:
             dict: API response dict
         """
-        ep = Assertion.ENDPOINT + "/{}".format(self.entityId)
+        ep = self.get_entity_ep()
         response = self.client._call_api(ep, "DELETE")
 
         return response
@@ -167,6 +404,8 @@ class Assertion(Base):
 
 class BadgeClass(Base):
 
+    __slots__ = ()
+
     ENDPOINT = "/v2/badgeclasses"
 
     def __init__(
@@ -238,17 +477,18 @@ class BadgeClass(Base):
                 criteria_url is required"
             )
 
-        payload = {
-            "name": name,
-            "image": image,
-            "issuer": issuer_eid,
-            "description": description,
-            "criteria_text": criteria_text,
-            "criteria_url": criteria_url,
-            "alignments": alignments if alignments else [],
-            "tags": tags if tags else [],
-            "expires": expires,
-        }
+        fields = (
+            ("name", name),
+            ("image", image),
+            ("issuer", issuer_eid),
+            ("description", description),
+            ("criteria_text", criteria_text),
+            ("criteria_url", criteria_url),
+            ("alignments", alignments or _EMPTY),
+            ("tags", tags or _EMPTY),
+            ("expires", expires),
+        )
+        payload = {k: v for k, v in fields if v is not None}
 
         # if badgename is not unique with unique_badge_names=True
         # throw an exception
@@ -278,28 +518,37 @@ class BadgeClass(Base):
 
     @eid_required
     def fetch_assertions(
-        self, recipient=None, num=None, query=None
+        self, recipient=None, num=None, query=None, fields=None, prefetch=()
     ) -> List[Assertion]:
         """
-        Get a list of Assertions for this badgeclass
+        Get a list of Assertions for this badgeclass. The returned assertions
+        are populated from the list response and don't need to be fetched again
 
         Args:
             recipient (string, optional): Filter by recipient
             num (string, optional): Request pagination
                 of results
             query (dict, optional): Query params
+            fields (list[str], optional): Only ask for these fields, e.g.
+                ['entityId', 'recipient'] to leave out the image
+            prefetch (tuple, optional): Related entities to load along with
+                the assertions, e.g. ('issuer',)
         """
-        ep = BadgeClass.ENDPOINT + "/{}/assertions".format(self.entityId)
+        ep = f"{BadgeClass.ENDPOINT}/{self.entityId}/assertions"
         if recipient:
             if not query:
                 query = {}
 
             query["recipient"] = recipient
 
+        query = _with_fields(query, fields)
+        self.client._check_prefetch(prefetch)
         response = self.client._call_api(ep, params=query)
         result = cast(
-            List[Assertion], self.client._deserialize(response["result"])
+            List[Assertion],
+            self.client._deserialize(response["result"], prefetch),
         )
+        _mark_partial(result, fields)
         return result
 
     @eid_required
@@ -340,7 +589,12 @@ class BadgeClass(Base):
 
 class Issuer(Base):
 
-    V1_ENDPOINT = "/v1/issuer/issuers/{slug}/staff"
+    __slots__ = ()
+
+    V1_ENDPOINT_PREFIX = "/v1/issuer/issuers/"
+    V1_ENDPOINT_SUFFIX = "/staff"
+    _VALID_ACTIONS = frozenset({"add", "modify", "remove"})
+    _VALID_ROLES = frozenset({"owner", "editor", "staff"})
     ENDPOINT = "/v2/issuers"
 
     def create(self, name, description, email, url, image=None) -> "Issuer":
@@ -368,38 +622,66 @@ class Issuer(Base):
         return self
 
     @eid_required
-    def fetch_assertions(self, query=None) -> List[Assertion]:
-        """Get list of assertions for this issuer
+    def fetch_assertions(
+        self, query=None, fields=None, prefetch=()
+    ) -> List[Assertion]:
+        """Get list of assertions for this issuer. The returned assertions
+        are populated from the list response and don't need to be fetched again
+
         Args:
             query (dict, optional): Query params
+            fields (list[str], optional): Only ask for these fields, e.g.
+                ['entityId', 'recipient'] to leave out the image
+            prefetch (tuple, optional): Related entities to load along with
+                the assertions, e.g. ('badgeclass',)
         """
-        ep = Issuer.ENDPOINT + "/{}/assertions".format(self.entityId)
-        response = self.client._call_api(ep, params=query)
+        ep = f"{Issuer.ENDPOINT}/{self.entityId}/assertions"
+        self.client._check_prefetch(prefetch)
+        response = self.client._call_api(
+            ep, params=_with_fields(query, fields)
+        )
         result = cast(
-            List[Assertion], self.client._deserialize(response["result"])
+            List[Assertion],
+            self.client._deserialize(response["result"], prefetch),
         )
+        _mark_partial(result, fields)
 
         return result
 
     @eid_required
     def fetch_badgeclasses(
-        self, load_badge_names: bool = True, query=None
+        self,
+        load_badge_names: bool = True,
+        query=None,
+        fields=None,
+        prefetch=(),
     ) -> List[BadgeClass]:
-        """Get a list of BadgeClasses for this issuer
+        """Get a list of BadgeClasses for this issuer. The returned badgeclasses
+        are populated from the list response and don't need to be fetched again
 
         Args:
             load_badge_names (bool, optional): Should the fetched data be used
                 to load badge names if unique_badge_names is True. Defaults to True.
             query (dict, optional):  Query params. Defaults to None.
+            fields (list[str], optional): Only ask for these fields, e.g.
+                ['entityId', 'name', 'issuer'] to leave out the image.
+                Defaults to None.
+            prefetch (tuple, optional): Related entities to load along with
+                the badgeclasses. Defaults to ().
 
         Returns:
-            List[BadgeClass]: [description]
+            List[BadgeClass]: BadgeClasses of this issuer
         """
-        ep = Issuer.ENDPOINT + "/{}/badgeclasses".format(self.entityId)
-        response = self.client._call_api(ep, params=query)
+        ep = f"{Issuer.ENDPOINT}/{self.entityId}/badgeclasses"
+        self.client._check_prefetch(prefetch)
+        response = self.client._call_api(
+            ep, params=_with_fields(query, fields)
+        )
         result = cast(
-            List[BadgeClass], self.client._deserialize(response["result"])
+            List[BadgeClass],
+            self.client._deserialize(response["result"], prefetch),
         )
+        _mark_partial(result, fields)
 
         if load_badge_names and self.client.unique_badge_names:
             for badge in result:
@@ -470,25 +752,26 @@ class Issuer(Base):
 
         Raises:
             BadgrClientError: Action must be one of 'add', 'modify' or 'remove'
-            BadgrClientError: Action must be one of 'owner', 'editor', or 'staff'
+            BadgrClientError: Role must be one of 'owner', 'editor', or 'staff'
         """
 
-        if action not in ["add", "modify", "remove"]:
+        if action not in Issuer._VALID_ACTIONS:
             raise BadgrClientError(
                 "Action must be one of 'add', 'modify' or 'remove'"
             )
 
-        if role not in ["owner", "editor", "staff"]:
+        if role not in Issuer._VALID_ROLES:
             raise BadgrClientError(
-                "Action must be one of 'owner', 'editor', or 'staff'"
+                "Role must be one of 'owner', 'editor', or 'staff'"
             )
 
         payload = {"action": action, "email": email, "role": role}
 
-        response = self.client._call_api(
-            Issuer.V1_ENDPOINT.format(slug=self.entityId), "POST", data=payload
+        ep = (
+            f"{Issuer.V1_ENDPOINT_PREFIX}{self.entityId}"
+            f"{Issuer.V1_ENDPOINT_SUFFIX}"
         )
-
-        self.fetch(self.get_entity_ep())
+        response = self.client._call_api(ep, "POST", data=payload)
+        self._set_data_or_fetch(response)
 
         return response
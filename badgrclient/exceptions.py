@@ -4,3 +4,13 @@ class APIError(Exception):
 
 class BadgrClientError(Exception):
     pass
+
+
+class BatchIssueError(APIError):
+    """Raised when a batch of Assertion.create_many fails. Batches are not
+    atomic, assertions holds the ones issued by earlier batches in the order
+    of the specs, with None for those that weren't issued"""
+
+    def __init__(self, message, assertions):
+        super().__init__(message)
+        self.assertions = assertions
@@ -1,4 +1,5 @@
 import functools
+from .exceptions import BadgrClientError
 
 
 def eid_required(func):
@@ -7,6 +8,6 @@ def eid_required(func):
         if self.entityId:
             return func(self, *args, **kwargs)
         else:
-            raise Exception("entityId is required for this operation")
+            raise BadgrClientError("entityId is required for this operation")
 
     return check_id
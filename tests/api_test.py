@@ -1,7 +1,9 @@
 import pytest
+import threading
 import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
 from badgrclient import BadgrClient, Issuer, BadgeClass, Assertion
-from badgrclient.exceptions import BadgrClientError
+from badgrclient.exceptions import APIError, BadgrClientError, BatchIssueError
 from pathlib import Path
 
 
@@ -109,6 +111,16 @@ def test_token_refresh(requests_mock):
     client.fetch_assertion()
 
     assert client.header == {"Authorization": "Bearer refreshed_token"}
+    assert client.session.headers["Authorization"] == "Bearer refreshed_token"
+
+
+def test_session_adapter(client):
+    """Test the pooled adapter is mounted on the session"""
+
+    adapter = client.session.get_adapter("https://badgr.example.com")
+
+    assert adapter.max_retries.total == 3
+    assert client.session.headers["Authorization"] == "Bearer mock_token"
 
 
 def test_fetch_tokens(client, mocker):
@@ -260,9 +272,7 @@ def test_create_badgeclass(client, mocker):
             "criteria_url": "https://github.com/dtgay/badges/blob/master/docs/badges.rst",  # noqa: E501
             "image": "data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVQYV2Ng+M9QDwADgQF/iwmQSQAAAABJRU5ErkJggg==",  # noqa: E501
             "tags": ["irc", "community"],
-            "alignments": [],
-            "expires": None,
-            "criteria_text": None,
+            "alignments": (),
         },
     )
 
@@ -367,10 +377,8 @@ def test_create_assertion_with_badge_name(loaded_badges_client, mocker):
                 "type": "email",
                 "identity": "test@test.com",
             },
-            "narrative": None,
-            "evidence": [],
+            "evidence": (),
             "notify": True,
-            "expires": None,
             "issuedOn": "dummy",
         },
     )
@@ -397,3 +405,366 @@ def test_create_badge_class_with_non_unique_name(loaded_badges_client):
             image="idk",
             description="something",
         )
+
+
+def test_fetch_many(client, mocker):
+    mocker.patch(
+        "badgrclient.BadgrClient._call_api",
+        return_value={
+            "result": [
+                get_badgeclass_data(entityId="b"),
+                get_badgeclass_data(entityId="a"),
+            ]
+        },
+    )
+    badges = BadgeClass.fetch_many(client, ["a", "b", "c"])
+    BadgrClient._call_api.assert_called_once_with(
+        "/v2/badgeclasses", params={"entityId__in": "a,b,c"}
+    )
+
+    assert [badge.entityId for badge in badges] == ["a", "b"]
+    assert badges[0].data["entityId"] == "a"
+
+
+def test_eid_required(client, mocker):
+    mocker.patch("badgrclient.BadgrClient._call_api")
+    with pytest.raises(BadgrClientError):
+        Issuer(client).fetch_badgeclasses()
+
+    BadgrClient._call_api.assert_not_called()
+
+
+def test_create_many_assertions(client, mocker):
+    mocker.patch(
+        "badgrclient.BadgrClient._call_api",
+        side_effect=[
+            {"result": [{"entityId": "a1"}, {"entityId": "a3"}]},
+            {"result": [{"entityId": "a2"}]},
+        ],
+    )
+    assertions = Assertion.create_many(
+        client,
+        [
+            {"recipient_email": "a@a.com", "badge_eid": "bc1", "issued_on": "d"},
+            {"recipient_email": "b@b.com", "badge_eid": "bc2", "issued_on": "d"},
+            {"recipient_email": "c@c.com", "badge_eid": "bc1", "issued_on": "d"},
+        ],
+    )
+
+    assert [a.entityId for a in assertions] == ["a1", "a2", "a3"]
+    assert BadgrClient._call_api.call_count == 2
+    first_call = BadgrClient._call_api.call_args_list[0]
+    assert first_call.args == ("/v2/badgeclasses/bc1/issue", "POST")
+    assert [
+        a["recipient"]["identity"]
+        for a in first_call.kwargs["data"]["assertions"]
+    ] == ["a@a.com", "c@c.com"]
+    assert first_call.kwargs["data"]["create_notification"] is True
+
+
+def test_call_api_json_body(client, requests_mock):
+    requests_mock.post(
+        "http://localhost:8000/v2/issuers", text='{"result": [{"entityId": "i"}]}'
+    )
+    response = client._call_api("/v2/issuers", "POST", data={"name": "Fedora"})
+
+    assert response == {"result": [{"entityId": "i"}]}
+    assert requests_mock.last_request.json() == {"name": "Fedora"}
+    assert requests_mock.last_request.headers["Content-Type"] == "application/json"
+
+
+def test_update_uses_response(client, mocker):
+    mocker.patch(
+        "badgrclient.BadgrClient._call_api",
+        return_value={"result": [get_badgeclass_data(name="Renamed")]},
+    )
+    badge = BadgeClass(client).set_data(get_badgeclass_data())
+    badge.update()
+
+    BadgrClient._call_api.assert_called_once()
+    assert badge.data["name"] == "Renamed"
+
+
+def test_fetch_badgeclasses_fields(client, mocker):
+    partial = {"entityType": "BadgeClass", "entityId": "b", "name": "Speak Up!"}
+    mocker.patch(
+        "badgrclient.BadgrClient._call_api",
+        side_effect=[
+            {"result": [partial]},
+            {"result": [get_badgeclass_data(entityId="b")]},
+        ],
+    )
+    badges = Issuer(client, eid="i").fetch_badgeclasses(
+        fields=["entityId", "name"]
+    )
+    BadgrClient._call_api.assert_called_once_with(
+        "/v2/issuers/i/badgeclasses", params={"fields": "entityId,name"}
+    )
+
+    assert badges[0].image == "http://localhost:8000/media/test/some.png"
+    BadgrClient._call_api.assert_called_with("/v2/badgeclasses/b")
+
+
+def test_edit_staff_invalid_role(client, mocker):
+    mocker.patch("badgrclient.BadgrClient._call_api")
+    with pytest.raises(BadgrClientError, match="Role must be one of"):
+        Issuer(client, eid="i").edit_staff("add", "a@a.com", "admin")
+
+    BadgrClient._call_api.assert_not_called()
+
+
+def test_fetch_assertions_prefetch(client, mocker):
+    assertions = [
+        {"entityType": "Assertion", "entityId": "a1", "badgeclass": "b"},
+        {"entityType": "Assertion", "entityId": "a2", "badgeclass": "b"},
+    ]
+    mocker.patch(
+        "badgrclient.BadgrClient._call_api",
+        side_effect=[
+            {"result": assertions},
+            {"result": [get_badgeclass_data(entityId="b")]},
+        ],
+    )
+    Issuer(client, eid="i").fetch_assertions(prefetch=("badgeclass",))
+
+    assert BadgrClient._call_api.call_count == 2
+    BadgrClient._call_api.assert_called_with(
+        "/v2/badgeclasses", params={"entityId__in": "b"}
+    )
+
+    badge = BadgeClass(client, eid="b")
+    assert badge.data["name"] == "Speak up!"
+    assert BadgrClient._call_api.call_count == 2
+
+
+def test_prefetched_data_is_copied(client):
+    client._prefetched[(BadgeClass, "b")] = get_badgeclass_data(entityId="b")
+
+    BadgeClass(client, eid="b").data["name"] = "unsaved edit"
+
+    assert BadgeClass(client, eid="b").data["name"] == "Speak up!"
+
+
+def test_prefetched_data_is_dropped(client, mocker):
+    mocker.patch(
+        "badgrclient.BadgrClient._call_api",
+        return_value={"result": [{"entityId": "i", "name": "Fedora"}]},
+    )
+    client._prefetched[(Issuer, "i")] = {"entityId": "i"}
+    Issuer(client, eid="i").edit_staff("add", "a@a.com", "staff")
+
+    assert (Issuer, "i") not in client._prefetched
+
+    client._prefetched[(Issuer, "i")] = {"entityId": "i"}
+    Issuer(client, eid="i").fetch()
+
+    assert (Issuer, "i") not in client._prefetched
+
+    client._prefetched[(Issuer, "i")] = {"entityId": "i"}
+    client.clear_prefetched()
+
+    assert client._prefetched == {}
+
+
+def test_create_many_assertions_missing_result(client, mocker):
+    mocker.patch(
+        "badgrclient.BadgrClient._call_api",
+        return_value={"result": [{"entityId": "a1"}]},
+    )
+    with pytest.raises(APIError):
+        Assertion.create_many(
+            client,
+            [
+                {"recipient_email": "a@a.com", "badge_eid": "bc1"},
+                {"recipient_email": "b@b.com", "badge_eid": "bc1"},
+            ],
+        )
+
+
+def test_image_fetched_once(client, mocker):
+    mocker.patch(
+        "badgrclient.BadgrClient._call_api",
+        return_value={"result": [{"entityId": "i", "name": "Fedora"}]},
+    )
+    issuer = Issuer(client, eid="i")
+
+    for _ in range(3):
+        assert issuer.image is None
+
+    BadgrClient._call_api.assert_called_once_with("/v2/issuers/i")
+
+
+def test_entity_ep_follows_entity_id(client):
+    issuer = Issuer(client, eid="a")
+    assert issuer.get_entity_ep() == "/v2/issuers/a"
+
+    issuer.entityId = "b"
+    assert issuer.get_entity_ep() == "/v2/issuers/b"
+
+    issuer.set_data({"entityId": "c"})
+    assert issuer.get_entity_ep() == "/v2/issuers/c"
+
+
+class UnavailableHandler(BaseHTTPRequestHandler):
+    requests = 0
+
+    def do_GET(self):
+        UnavailableHandler.requests += 1
+        body = b'{"error": "Service unavailable"}'
+        self.send_response(503)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_retries_end_in_api_error():
+    """Test the real adapter retries and then raises the server's error"""
+
+    server = HTTPServer(("127.0.0.1", 0), UnavailableHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    try:
+        client = BadgrClient(
+            username=None,
+            password=None,
+            client_id="kewl_client",
+            base_url="http://127.0.0.1:{}".format(server.server_port),
+            token="token",
+            refresh_token="refresh_token",
+        )
+        adapter = client.session.get_adapter(client.base_url)
+        adapter.max_retries = adapter.max_retries.new(backoff_factor=0)
+
+        with pytest.raises(APIError, match="Service unavailable"):
+            client.fetch_issuer()
+
+        assert UnavailableHandler.requests == 4
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_create_payload_on_the_wire(client, requests_mock):
+    requests_mock.post(
+        "http://localhost:8000/v2/badgeclasses",
+        text='{"result": [{"entityId": "b"}]}',
+    )
+    requests_mock.post(
+        "http://localhost:8000/v2/badgeclasses/b/assertions",
+        text='{"result": [{"entityId": "a"}]}',
+    )
+    BadgeClass(client).create(
+        "Speak Up!", "image", "description", "i", criteria_text="criteria"
+    )
+    body = requests_mock.last_request.json()
+
+    assert body["alignments"] == []
+    assert body["tags"] == []
+    assert "expires" not in body
+    assert "criteria_url" not in body
+
+    Assertion(client).create("jane@mailg.com", badge_eid="b")
+    body = requests_mock.last_request.json()
+
+    assert body["evidence"] == []
+    assert "narrative" not in body
+    assert "expires" not in body
+
+
+def test_prefetch_refetches(client, mocker):
+    assertions = {
+        "result": [
+            {"entityType": "Assertion", "entityId": "a", "badgeclass": "b"}
+        ]
+    }
+    mocker.patch(
+        "badgrclient.BadgrClient._call_api",
+        side_effect=[
+            assertions,
+            {"result": [get_badgeclass_data(entityId="b")]},
+            assertions,
+            {"result": [get_badgeclass_data(entityId="b", name="Renamed")]},
+        ],
+    )
+    issuer = Issuer(client, eid="i")
+    issuer.fetch_assertions(prefetch=("badgeclass",))
+    issuer.fetch_assertions(prefetch=("badgeclass",))
+
+    assert BadgrClient._call_api.call_count == 4
+    assert BadgeClass(client, eid="b").data["name"] == "Renamed"
+
+
+def test_fetch_many_skips_missing(client, mocker):
+    mocker.patch(
+        "badgrclient.BadgrClient._call_api", return_value={"result": []}
+    )
+    client._prefetched[(Issuer, "x")] = {"entityId": "x"}
+
+    assert Issuer.fetch_many(client, ["x"]) == []
+
+
+def test_fetch_many_refreshes_prefetched(client, mocker):
+    mocker.patch(
+        "badgrclient.BadgrClient._call_api",
+        return_value={"result": [{"entityId": "x", "name": "New"}]},
+    )
+    client._prefetched[(Issuer, "x")] = {"entityId": "x", "name": "Old"}
+    Issuer.fetch_many(client, ["x"])
+
+    assert client._prefetched[(Issuer, "x")]["name"] == "New"
+
+
+def test_unknown_prefetch(client, mocker):
+    mocker.patch("badgrclient.BadgrClient._call_api")
+    with pytest.raises(BadgrClientError):
+        Issuer(client, eid="i").fetch_assertions(prefetch=("badge",))
+
+    BadgrClient._call_api.assert_not_called()
+
+
+def test_prefetched_is_bounded(client, mocker):
+    mocker.patch("badgrclient.badgrclient.MAX_PREFETCHED", 2)
+    for eid in ("a", "b", "c"):
+        client._store_prefetched(Issuer, {"entityId": eid})
+
+    assert list(client._prefetched) == [(Issuer, "b"), (Issuer, "c")]
+
+
+def test_create_many_assertions_second_batch_fails(client, mocker):
+    mocker.patch(
+        "badgrclient.BadgrClient._call_api",
+        side_effect=[
+            {"result": [{"entityId": "a1"}]},
+            APIError("Badgeclass not found"),
+        ],
+    )
+    with pytest.raises(BatchIssueError) as err:
+        Assertion.create_many(
+            client,
+            [
+                {"recipient_email": "a@a.com", "badge_eid": "bc1"},
+                {"recipient_email": "b@b.com", "badge_eid": "bc2"},
+            ],
+        )
+
+    assert [a and a.entityId for a in err.value.assertions] == ["a1", None]
+
+
+def test_update_partial(client, mocker):
+    mocker.patch(
+        "badgrclient.BadgrClient._call_api",
+        return_value={
+            "result": [{"entityType": "BadgeClass", "entityId": "b"}]
+        },
+    )
+    badges = Issuer(client, eid="i").fetch_badgeclasses(fields=["entityId"])
+
+    with pytest.raises(BadgrClientError):
+        badges[0].update()
+
+    BadgrClient._call_api.assert_called_once()